@@ -2,15 +2,17 @@
 Metric Tensor and Derivatives of Basis Vectors.
 """
 
-import copy
 import warnings
+from functools import lru_cache
 from typing import List, Optional
 
 from sympy import (
     diff, trigsimp, Matrix, Rational,
-    sqf_list, sqrt, eye, S, expand, Mul,
-    Add, simplify, Expr, Function, MatrixSymbol
+    sqf_list, sqrt, eye, zeros, S, expand, Mul,
+    Add, simplify, cancel, Expr, Function, MatrixSymbol
 )
+from sympy.core.cache import cacheit
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
 
 from . import printer
 from ._utils import cached_property as _cached_property
@@ -31,51 +33,93 @@ def apply_function_list(f, x):
         return f(x)
 
 
-def linear_expand(expr):
+def _is_expanded_term(term):
     """
-    linear_expand takes an expression that is the sum of a scalar
-    expression and a linear combination of noncommutative terms with
-    scalar coefficients and generates lists of coefficients and
-    noncommutative symbols the coefficients multiply.  The list of
-    noncommutatives symbols contains the scalar 1 if there is a scalar
-    term in the sum and also does not contain any repeated noncommutative
-    symbols.
+    Cheap structural check that `expand` would leave `term` unchanged, which
+    holds for a product of atoms and powers of atoms.
+    """
+    def is_atom_or_atom_pow(x):
+        return x.is_Atom or (x.is_Pow and x.base.is_Atom and x.exp.is_Atom)
+
+    if term.is_Mul:
+        return all(is_atom_or_atom_pow(arg) for arg in term.args)
+    return is_atom_or_atom_pow(term)
+
+
+def _expand_if_needed(expr):
+    """
+    `expand` is expensive on noncommutative expressions, so skip it when
+    the expression is already a sum of products of atoms.
+    """
+    if expr.is_Add:
+        if all(_is_expanded_term(arg) for arg in expr.args):
+            return expr
+    elif _is_expanded_term(expr):
+        return expr
+    return expand(expr)
+
+
+@cacheit
+def _linear_expand_items(expr):
+    """
+    Implementation of :func:`linear_expand`, returning a tuple of pairs of
+    each noncommutative symbol (or the scalar 1) and its coefficient.
+
+    The result is cached, so is immutable; use :func:`_linear_expand_dict`
+    for a mutable version.
     """
     if not isinstance(expr, Expr):
         raise TypeError('{!r} is not a SymPy Expr'.format(expr))
 
-    expr = expand(expr)
+    expr = _expand_if_needed(expr)
 
     if expr == 0:
-        coefs = [expr]
-        bases = [S(1)]
-        return (coefs, bases)
+        return ((S(1), expr),)
 
     if isinstance(expr, Add):
         args = expr.args
     else:
         if expr.is_commutative:
-            return ([expr], [S(1)])
+            return ((S(1), expr),)
         else:
             args = [expr]
-    coefs = []
-    bases = []
+    terms = {}
     for term in args:
         if term.is_commutative:
-            if S(1) in bases:
-                coefs[bases.index(S(1))] += term
-            else:
-                bases.append(S(1))
-                coefs.append(term)
+            base = S(1)
+            coef = term
         else:
             c, nc = term.args_cnc()
             base = nc[0]
             coef = Mul._from_args(c)
-            if base in bases:
-                coefs[bases.index(base)] += coef
-            else:
-                bases.append(base)
-                coefs.append(coef)
+        if base in terms:
+            terms[base] += coef
+        else:
+            terms[base] = coef
+    return tuple(terms.items())
+
+
+def _linear_expand_dict(expr):
+    """
+    Implementation of :func:`linear_expand`, returning a dictionary mapping
+    each noncommutative symbol (or the scalar 1) to its coefficient.
+    """
+    return dict(_linear_expand_items(expr))
+
+
+def linear_expand(expr):
+    """
+    linear_expand takes an expression that is the sum of a scalar
+    expression and a linear combination of noncommutative terms with
+    scalar coefficients and generates lists of coefficients and
+    noncommutative symbols the coefficients multiply.  The list of
+    noncommutatives symbols contains the scalar 1 if there is a scalar
+    term in the sum and also does not contain any repeated noncommutative
+    symbols.
+    """
+    terms = _linear_expand_items(expr)
+    coefs = [coef for base, coef in terms]
+    bases = [base for base, coef in terms]
     return (coefs, bases)
 
 
@@ -101,21 +145,24 @@ def collect(A, nc_list):
         of `nc_list` appear more than once in the sum. All coefficients of a given element of `nc_list`
         are combined into a single coefficient.
     """
-    coefs, bases = linear_expand(A)
-    C = S(0)
-    for x in nc_list:
-        if x in bases:
-            i = bases.index(x)
-            bases.pop(i)
-            C += coefs.pop(i)*x
+    # callers usually pass a list, which cannot be used as a cache key
+    return _collect(A, tuple(nc_list))
+
+
+@cacheit
+def _collect(A, nc_list):
+    """ Implementation of :func:`collect`, cached on its arguments """
+    terms = _linear_expand_dict(A)
+    C = [terms.pop(x)*x for x in nc_list if x in terms]
 
     # add whatever is left
-    for c, b in zip(coefs, bases):
-        C += c * b
+    C += [c * b for b, c in terms.items()]
 
-    return C
+    # a single `Add` rather than growing the sum one term at a time
+    return Add(*C)
 
 
+@cacheit
 def square_root_of_expr(expr):
     """
     If expression is product of even powers then every power is divided
@@ -131,6 +178,9 @@ def square_root_of_expr(expr):
             return sqrt(-expr)
     else:
         expr = trigsimp(expr)
+        if expr.is_Pow and expr.exp.is_Integer and expr.exp % 2 == 0 and not expr.base.is_Add:
+            # a single even power of a non-sum, which factoring would leave alone
+            return expr.base ** (expr.exp // 2)
         coef, pow_lst = sqf_list(expr)
         if coef != S(1):
             if coef.is_number:
@@ -234,6 +284,14 @@ def symbols_list(s, indices=None, sub=True, commutative=False):
     if isinstance(s, list):  # s is already a list of symbols
         return s
 
+    if indices is not None:
+        indices = tuple(indices)  # so that it can be used as a cache key
+    return list(_symbols_list(s, indices, sub, commutative))
+
+
+@lru_cache(maxsize=256)
+def _symbols_list(s, indices, sub, commutative):
+    """ Implementation of :func:`symbols_list`, cached on its arguments """
     if sub is True:  # subscripted list
         pos = '_'
     else:  # superscripted list
@@ -266,7 +324,26 @@ def symbols_list(s, indices=None, sub=True, commutative=False):
 
     else:  # indices symbol list used for sub/superscripts of generated symbol list
         s_lst = [s + pos + str(i) for i in indices]
-    return [BasisVectorSymbol(s, commutative=commutative) for s in s_lst]
+    return tuple(BasisVectorSymbol(s, commutative=commutative) for s in s_lst)
+
+
+@cacheit
+def _apply_modes(coef, modes):
+    """ :func:`apply_function_list`, cached so shared coefficients are only simplified once """
+    return apply_function_list(modes, coef)
+
+
+@cacheit
+def _simp_apply(expr, modes):
+    """ Implementation of :meth:`Simp.apply`, cached on `expr` and the `modes` used """
+    if isinstance(expr, Expr) and expr.is_commutative:
+        # a pure scalar, which `linear_expand` would return as the only
+        # coefficient, of `S(1)`
+        return _apply_modes(_expand_if_needed(expr), modes)
+    obj = S(0)
+    for coef, base in linear_expand_terms(expr):
+        obj += _apply_modes(coef, modes) * base
+    return obj
 
 
 class Simp:
@@ -276,18 +353,45 @@ class Simp:
     def profile(s):
         Simp.modes = s
 
+    @staticmethod
+    def clear_cache():
+        _simp_apply.cache_clear()
+        _apply_modes.cache_clear()
+
     @staticmethod
     def apply(expr):
-        obj = S(0)
-        for coef, base in linear_expand_terms(expr):
-            obj += apply_function_list(Simp.modes, coef) * base
-        return obj
+        modes = Simp.modes
+        if isinstance(modes, list):
+            # a snapshot, so the cache key also notices in-place edits. This
+            # is deliberately not composed into a single function, which
+            # would be a new cache key on every call.
+            modes = tuple(modes)
+        return _simp_apply(expr, modes)
 
     @staticmethod
     def applymv(mv):
         return Mv(Simp.apply(mv.obj), ga=mv.Ga)
 
 
+def _cancel_metric_entry(expr):
+    """
+    Cheap replacement for `simplify` on the entries of the inverse or
+    adjugate of a metric, which are rational functions of its entries.
+    """
+    expr = cancel(expr)
+    if expr.has(TrigonometricFunction):
+        # `cancel` cannot use identities such as sin**2 + cos**2 = 1
+        expr = trigsimp(expr)
+    return expr
+
+
+def _simp_nonzero(expr):
+    """ :meth:`Simp.apply`, skipped for the (common) structurally zero case """
+    if expr == 0:
+        return S(0)
+    return Simp.apply(expr)
+
+
 class Metric(object):
     """
     Metric specification
@@ -441,12 +545,28 @@ class Metric(object):
             "the `.dg` property is now always available.",
             DeprecationWarning, stacklevel=2)
 
+    @_cached_property
+    def _g_is_symmetric(self) -> bool:
+        """ True if :attr:`g` is structurally symmetric, :math:`g_{ij} = g_{ji}` """
+        return self.g.is_symmetric(simplify=False)
+
+    @_cached_property
+    def _dg_by_k(self) -> List[Matrix]:
+        # _dg_by_k[k][i, j] = \partial_{x_{k}}g_{ij}
+        # Differentiate the whole matrix at once for each coordinate, and
+        # skip the coordinates that g does not depend on at all.
+        g_symbols = self.g.free_symbols
+        return [
+            self.g.diff(x_k) if x_k in g_symbols else zeros(self.n)
+            for x_k in self.coords
+        ]
+
     @_cached_property
     def dg(self) -> List[List[List[Expr]]]:
         # dg[i][j][k] = \partial_{x_{k}}g_{ij}
         return [[[
-            diff(self.g[i, j], x_k)
-            for x_k in self.coords]
+            dg_k[i, j]
+            for dg_k in self._dg_by_k]
             for j in self.n_range]
             for i in self.n_range]
 
@@ -455,12 +575,17 @@ class Metric(object):
         """ True if connection is non-zero """
         if self.coords is None:
             return False
+        elif not self.g.free_symbols & set(self.coords):
+            # no entry of g depends on the coordinates, so dg is zero
+            # without needing to compute it
+            return False
         else:
+            # `!= 0` is a structural comparison, so is cheap and exits on
+            # the first nonzero derivative
             return any(
-                self.dg[i][j][k] != 0
-                for i in self.n_range
-                for j in self.n_range
-                for k in self.n_range
+                dg_k_ij != 0
+                for dg_k in self._dg_by_k
+                for dg_k_ij in dg_k
             )
 
     @_cached_property
@@ -501,17 +626,19 @@ class Metric(object):
         if self.is_ortho:  # Orthogonal metric
             g_inv = eye(self.n)
             for i in range(self.n):
-                g_inv[i, i] = S(1)/self.g(i, i)
+                g_inv[i, i] = S(1)/self.g[i, i]
             return g_inv
         elif self.gsym is None:
-            return simplify(self.g.inv())
+            # `cancel` is enough to tidy up the rational functions produced
+            # by the inverse, and much cheaper than a full `simplify`
+            return self.g.inv().applyfunc(_cancel_metric_entry)
         else:
             return self.g_adj/self.detg
 
     @_cached_property
     def g_adj(self) -> Matrix:
         """ Adjugate of g """
-        return simplify(self.g.adjugate())
+        return self.g.adjugate().applyfunc(_cancel_metric_entry)
 
     def Christoffel_symbols(self, mode=1):
         """
@@ -525,23 +652,37 @@ class Metric(object):
 
         n_range = self.n_range
 
-        # dg[i][j][k] = \partial_{x_{k}}g_{ij}
-        dg = self.dg
-
         if mode == 1:
+            n = self.n
+
+            # All the derivatives in one flat tuple, which is much cheaper to
+            # index than a Matrix,
+            # dg_flat[(k*n + i)*n + j] = \partial_{x_{k}}g_{ij}
+            dg_flat = tuple(
+                dg_k_ij
+                for dg_k in self._dg_by_k
+                for dg_k_ij in dg_k
+            )
 
             # Christoffel symbols of the first kind, \Gamma_{ijk}
             # \partial_{x^{i}}e_{j} = \Gamma_{ijk}e^{k}
 
             def Gamma_ijk(i, j, k):
-                return half * (dg[j][k][i] + dg[i][k][j] - dg[i][j][k])
+                return half * (
+                    dg_flat[(i*n + j)*n + k] + dg_flat[(j*n + i)*n + k] - dg_flat[(k*n + i)*n + j]
+                )
 
             # dG[i][j][k] = half * (dg[j][k][i] + dg[i][k][j] - dg[i][j][k])
-            dG = [[[
-                Simp.apply(Gamma_ijk(i, j, k))
-                for k in n_range]
-                for j in n_range]
-                for i in n_range]
+            # For a symmetric metric \Gamma_{ijk} = \Gamma_{jik}, so only
+            # simplify the entries with i <= j and reuse them for j < i.
+            is_sym = self._g_is_symmetric
+            dG = [[None for j in n_range] for i in n_range]
+            for i in n_range:
+                for j in n_range:
+                    if is_sym and j < i:
+                        dG[i][j] = list(dG[j][i])
+                    else:
+                        dG[i][j] = [_simp_nonzero(Gamma_ijk(i, j, k)) for k in n_range]
 
             if self.debug:
                 printer.oprint('Gamma_{ijk}', dG)
@@ -554,14 +695,25 @@ class Metric(object):
             # Christoffel symbols of the second kind, \Gamma_{ij}^{k} = \Gamma_{ijl}g^{lk}
             # \partial_{x^{i}}e_{j} = \Gamma_{ij}^{k}e_{k}
 
-            def Gamma2_ijk(i, j, k):
-                return sum([Gamma_ijl * self.g_inv[l, k] for l, Gamma_ijl in enumerate(Gamma1[i][j])])
+            g_inv = self.g_inv
 
-            Gamma2 = [[[
-                Simp.apply(Gamma2_ijk(i, j, k))
-                for k in n_range]
-                for j in n_range]
-                for i in n_range]
+            def Gamma2_ij(i, j):
+                if self.is_ortho:
+                    # g^{lk} is diagonal, so only the l = k term survives
+                    return [Gamma1[i][j][k] * g_inv[k, k] for k in n_range]
+                else:
+                    # contract all of k at once as a row vector times g^{lk}
+                    return list(Matrix([Gamma1[i][j]]) * g_inv)
+
+            # \Gamma_{ij}^{k} inherits the symmetry in i, j from \Gamma_{ijl}
+            is_sym = self._g_is_symmetric
+            Gamma2 = [[None for j in n_range] for i in n_range]
+            for i in n_range:
+                for j in n_range:
+                    if is_sym and j < i:
+                        Gamma2[i][j] = list(Gamma2[j][i])
+                    else:
+                        Gamma2[i][j] = [_simp_nonzero(Gamma2_ijk) for Gamma2_ijk in Gamma2_ij(i, j)]
 
             return Gamma2
         else:
@@ -573,16 +725,19 @@ class Metric(object):
             return
 
         #  Generate mapping for renormalizing reciprocal basis vectors
-        renorm = [
-            (self.r_symbols[ib], self.r_symbols[ib] / self.e_norm[ib])
+        renorm = {
+            self.r_symbols[ib]: self.r_symbols[ib] / self.e_norm[ib]
             for ib in self.n_range  # e^{ib} --> e^{ib}/|e_{ib}|
-        ]
+        }
 
         # Normalize derivatives of basis vectors
 
         for x_i in self.n_range:
             for jb in self.n_range:
-                self.de[x_i][jb] = Simp.apply((((self.de[x_i][jb].subs(renorm)
+                de_ij = self.de[x_i][jb]
+                if de_ij.has(*self.r_symbols):
+                    de_ij = de_ij.subs(renorm, simultaneous=True)
+                self.de[x_i][jb] = Simp.apply((((de_ij
                                               - diff(self.e_norm[jb], self.coords[x_i]) *
                                               self.basis[jb]) / self.e_norm[jb])))
         if self.debug:
@@ -597,7 +752,7 @@ class Metric(object):
                 self.g[ib, jb] = Simp.apply(self.g[ib, jb] / (self.e_norm[ib] * self.e_norm[jb]))
 
         if self.debug:
-            printer.oprint('e^{i}->e^{i}/|e_{i}|', renorm)
+            printer.oprint('e^{i}->e^{i}/|e_{i}|', list(renorm.items()))
             printer.oprint('renorm(g)', self.g)
 
     def signature(self):
@@ -772,26 +927,27 @@ class Metric(object):
                             m[i, i] = g[i]
                         self.g = m
 
-        self.g_raw = copy.deepcopy(self.g)  # save original metric tensor for use with submanifolds
+        self.g_raw = Matrix(self.g)  # save original metric tensor for use with submanifolds
 
         if self.debug:
             printer.oprint('g', self.g)
 
-        # Determine if metric is orthogonal
-
-        self.is_ortho = all(
-            self.g[i, j] == 0
-            for i in self.n_range
-            for j in self.n_range
-            if i < j
-        )
-
-        self.g_is_numeric = all(
-            self.g[i, j].is_number
-            for i in self.n_range
-            for j in self.n_range
-            if i < j
-        )
+        # Determine if metric is orthogonal and numeric, in a single pass
+
+        self.is_ortho = True
+        self.g_is_numeric = True
+        for i in self.n_range:
+            for j in range(i + 1, self.n):
+                g_ij = self.g[i, j]
+                if self.is_ortho and g_ij != 0:
+                    self.is_ortho = False
+                if self.g_is_numeric and not g_ij.is_number:
+                    self.g_is_numeric = False
+                if not (self.is_ortho or self.g_is_numeric):
+                    break
+            else:
+                continue
+            break  # both flags are settled, stop scanning
 
         if self.coords is not None:
             if self.norm:  # normalize basis, metric, and derivatives of normalized basis
@@ -1,6 +1,6 @@
 import sys
 import pytest
-from sympy import symbols, sin, cos, Rational, expand, collect, simplify, Symbol, S, Add
+from sympy import symbols, sin, cos, Rational, expand, collect, simplify, Symbol, S, Add, Matrix, eye
 from galgebra.printer import Format, Eprint, latex, GaPrinter
 from galgebra.ga import Ga, one, zero
 from galgebra.mv import Mv, Nga
@@ -497,6 +497,116 @@ class TestTest:
 
         assert metric.collect(2*e1 + e2, [e1]) == 2*e1 + e2
 
+    def test_simp_cache(self):
+        x = Symbol('x')
+        e = sin(x)**2 + cos(x)**2
+
+        assert metric.Simp.apply(e) == 1
+        # changing the profile must not reuse results from the old one
+        default = metric.Simp.modes
+        try:
+            metric.Simp.profile([expand])
+            assert metric.Simp.apply(e) == e
+        finally:
+            metric.Simp.profile(default)
+        assert metric.Simp.apply(e) == 1
+
+        # nor must editing the current profile in place
+        modes = [simplify]
+        try:
+            metric.Simp.profile(modes)
+            assert metric.Simp.apply(e) == 1
+            modes[0] = expand
+            assert metric.Simp.apply(e) == e
+        finally:
+            metric.Simp.profile(default)
+
+        metric.Simp.apply(e)
+        metric.Simp.clear_cache()
+        assert metric._simp_apply.cache_info().currsize == 0
+        assert metric._apply_modes.cache_info().currsize == 0
+        assert metric.Simp.apply(e) == 1
+
+    def test_square_root_of_expr(self):
+        r, t = symbols('r t', real=True)
+
+        assert metric.square_root_of_expr(S(4)) == 2
+        assert metric.square_root_of_expr(r**2) == r
+        assert metric.square_root_of_expr(r**4) == r**2
+        assert metric.square_root_of_expr(r**2*sin(t)**2) == r*sin(t)
+        # the base of an even power is still simplified
+        assert metric.square_root_of_expr((sin(t)**2 + cos(t)**2)**2) == 1
+
+    def test_metric_dg(self):
+        coords = x, y = symbols('x y', real=True)
+        g = [[x**2, x*y], [x*y, y**2 + 1]]
+        ga = Ga('e*x|y', g=g, coords=coords)
+
+        for i in range(2):
+            for j in range(2):
+                for k in range(2):
+                    assert ga.dg[i][j][k] == ga.g[i, j].diff(coords[k])
+
+    def test_metric_g_inv(self):
+        coords = r, t = symbols('r t', real=True)
+
+        m = metric.Metric('e*1|2', g=[1, r**2], coords=coords)
+        assert m.g_inv == Matrix([[1, 0], [0, 1/r**2]])
+
+        m = metric.Metric('e*1|2', g=[[1, r], [r, r**2 + 1]], coords=coords)
+        assert m.g_inv == Matrix([[r**2 + 1, -r], [-r, 1]])
+        assert m.g * m.g_inv == eye(2)
+
+        u = Symbol('u', real=True)
+        m = metric.Metric('e*1|2', g=[[1, cos(u)], [cos(u), 1]], coords=(u, t))
+        assert m.g_inv == Matrix([
+            [1/sin(u)**2, -cos(u)/sin(u)**2],
+            [-cos(u)/sin(u)**2, 1/sin(u)**2],
+        ])
+        assert m.g_adj == Matrix([[1, -cos(u)], [-cos(u), 1]])
+
+    def test_christoffel_symbols_non_orthogonal(self):
+        coords = r, t = symbols('r t', real=True)
+        m = metric.Metric('e*1|2', g=[[1, r], [r, r**2 + 1]], coords=coords)
+
+        Gamma1 = m.Christoffel_symbols(mode=1)
+        Gamma2 = m.Christoffel_symbols(mode=2)
+        for i in range(2):
+            for j in range(2):
+                for k in range(2):
+                    expected = sum(Gamma1[i][j][l] * m.g_inv[l, k] for l in range(2))
+                    assert simplify(Gamma2[i][j][k] - expected) == 0
+
+    def test_metric_not_shared(self):
+        # identical constructor arguments still give independent algebras,
+        # since each one owns mutable state such as `g` and `de`
+        coords = r, th = symbols('r theta', positive=True)
+        ga1 = Ga('e', g=[1, r**2], coords=coords, norm=True)
+        ga2 = Ga('e', g=[1, r**2], coords=coords, norm=True)
+
+        assert ga1 is not ga2
+        assert ga1.g == ga2.g and ga1.g is not ga2.g
+        assert ga1.de == ga2.de and ga1.de is not ga2.de
+
+    def test_metric_signature_after_norm(self):
+        coords = r, th = symbols('r theta', positive=True)
+        m = metric.Metric('e', g=[-1, r**2], coords=coords, norm=True)
+        m.signature()
+        assert m.sig == (1, 1)
+
+    def test_christoffel_symbols(self):
+        coords = r, th = symbols('r theta', positive=True)
+        ga = Ga('e', g=[1, r**2], coords=coords)
+
+        assert ga.Christoffel_symbols(mode=1) == [
+            [[0, 0], [0, r]],
+            [[0, r], [-r, 0]],
+        ]
+        assert ga.Christoffel_symbols(mode=2) == [
+            [[0, 0], [0, 1/r]],
+            [[0, 1/r], [-r, 0]],
+        ]
+
     def test_dual_mode(self):
         ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
 